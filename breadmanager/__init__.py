@@ -1,4 +1,5 @@
 from .aws import *  # noqa: F403
 from .database import *  # noqa: F403
 from .ib import *  # noqa: F403
+from .store import *  # noqa: F403
 from .utils import *  # noqa: F403
@@ -329,3 +329,23 @@ def get_latest_record(connection, schema_name, table_name):
         logging.error(f"An error occurred: {e}")
         connection.rollback()
         return None
+
+
+def get_recent_records(connection, schema_name, table_name, limit):
+    # Returns the latest `limit` rows in ascending timestamp order
+    try:
+        with connection.cursor() as cursor:
+            query = f"""
+            SELECT timestamp, open, high, low, close, volume, average, bar_count
+            FROM {schema_name}.{table_name}
+            ORDER BY timestamp DESC
+            LIMIT %s
+            """
+            cursor.execute(query, (limit,))
+            records = cursor.fetchall()
+            records.reverse()
+            return records
+    except Exception as e:
+        logging.error(f"An error occurred: {e}")
+        connection.rollback()
+        return []
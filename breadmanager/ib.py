@@ -5,6 +5,8 @@ import time
 from datetime import datetime
 from pathlib import Path
 from ib_async import IB, Contract, Stock, util
+from .database import create_db_connection
+from .store import RecentBarStore, seed_recent_bars
 
 
 # Configure logging
@@ -23,6 +25,12 @@ def parse_arguments():
         default="/path/to/output/directory",
         help="Directory to save output CSV files",
     )
+    parser.add_argument(
+        "--exchange",
+        type=str,
+        default="NASDAQ",
+        help="Primary exchange the ticker's table was created with in historical_pull.py",
+    )
     return parser.parse_args()
 
 
@@ -83,24 +91,45 @@ def main():
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    contract = Stock(args.ticker, "SMART", "USD")
+    # historical_pull.py names tables after the primary exchange, not SMART
+    table_name = generate_contract_table_name(
+        Stock(args.ticker, args.exchange, "USD"), "1 min"
+    )
+
+    # Bars already held are revised in place, new ones are appended
+    recent_bars = RecentBarStore()
+    conn = create_db_connection(database="finance")
+    if conn:
+        seed_recent_bars(recent_bars, conn, "market_data", table_name, args.ticker)
+        conn.close()
+    else:
+        logging.warning("No database connection, recent bars start empty")
+
     while True:
         try:
             current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
             df = get_historical_df(
                 ib,
-                Stock(args.ticker, "SMART", "USD"),
+                contract,
                 endDateTime="",
                 durationStr="1 D",
                 barSizeSetting="1 min",
                 whatToShow="TRADES",
                 useRTH=True,
-                formatDate=1,
+                formatDate=2,  # UTC, the store rejects naive timestamps
             )
 
             output_file = output_dir / f"{args.ticker}_data_{current_time}.csv"
             df.to_csv(output_file)
             logging.info(f"Data saved to {output_file}")
 
+            # A cache failure must not be mistaken for a lost IB connection
+            try:
+                recent_bars.update_from_df(args.ticker, df)
+            except Exception as e:
+                logging.error(f"Failed to update recent bars: {e}")
+
             # Wait before the next fetch
             time.sleep(30)
         except Exception as e:
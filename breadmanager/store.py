@@ -0,0 +1,267 @@
+import logging
+import os
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from .database import get_recent_records
+
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume", "average", "bar_count")
+
+# 1 min bars: ~18 regular-hours sessions (390 bars each) per symbol, ~450 KB
+DEFAULT_CAPACITY = 7200
+
+
+def _to_ns(timestamp):
+    # A naive timestamp could be in any timezone, guessing would misorder bars
+    ts = pd.Timestamp(timestamp)
+    if ts.tzinfo is None:
+        raise ValueError(f"Timestamp {timestamp} must be timezone aware")
+    return ts.value
+
+
+class Bar:
+    __slots__ = ("timestamp",) + BAR_COLUMNS
+
+    def __init__(self, timestamp, open, high, low, close, volume, average, bar_count):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.average = average
+        self.bar_count = bar_count
+
+    def __repr__(self):
+        return f"Bar({self.timestamp}, close={self.close}, volume={self.volume})"
+
+
+class BarWindow:
+    __slots__ = ("timestamps", "values")
+
+    def __init__(self, timestamps, values):
+        # timestamps: int64 ns since epoch (UTC), values: (len(BAR_COLUMNS), n)
+        self.timestamps = timestamps
+        self.values = values
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def column(self, name):
+        return self.values[BAR_COLUMNS.index(name)]
+
+    def to_df(self):
+        # Same layout as get_historical_df so it can be fed to the same code
+        df = pd.DataFrame(
+            self.values.T,
+            index=pd.to_datetime(self.timestamps, utc=True),
+            columns=BAR_COLUMNS,
+        )
+        df.index.names = ["timestamp"]
+        # bar_count is nullable in the DB, NULLs are held as NaN
+        df["bar_count"] = df["bar_count"].astype("Int64")
+        return df
+
+
+def _empty_window():
+    return BarWindow(
+        np.empty(0, dtype=np.int64),
+        np.empty((len(BAR_COLUMNS), 0), dtype=np.float64),
+    )
+
+
+class BarRingBuffer:
+    __slots__ = ("capacity", "timestamps", "values", "_head", "_size")
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        # Column-major so a single column of the window is contiguous
+        self.values = np.zeros((len(BAR_COLUMNS), capacity), dtype=np.float64)
+        self._head = 0  # next slot to write
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        return self.timestamps.nbytes + self.values.nbytes
+
+    def _last_index(self):
+        return (self._head - 1) % self.capacity
+
+    @property
+    def last_timestamp(self):
+        # ns since epoch (UTC) of the newest bar, None when empty
+        if not self._size:
+            return None
+        return int(self.timestamps[self._last_index()])
+
+    def _segments(self):
+        # Slices of the underlying arrays in chronological order
+        if self._size < self.capacity:
+            return [slice(0, self._size)]
+        return [slice(self._head, self.capacity), slice(0, self._head)]
+
+    def append(self, timestamp_ns, values):
+        if self._size:
+            last = self._last_index()
+            last_ts = self.timestamps[last]
+            if timestamp_ns == last_ts:
+                # Live feed revising the bar that is still forming
+                self.values[:, last] = values
+                return
+            if timestamp_ns < last_ts:
+                logging.debug(f"Dropping out of order bar at {timestamp_ns}")
+                return
+
+        self.timestamps[self._head] = timestamp_ns
+        self.values[:, self._head] = values
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def latest(self):
+        if not self._size:
+            return None
+        last = self._last_index()
+        row = self.values[:, last]
+        bar_count = row[-1]
+        return Bar(
+            pd.Timestamp(int(self.timestamps[last]), tz="UTC"),
+            *row[:-1].tolist(),
+            None if np.isnan(bar_count) else int(bar_count),
+        )
+
+    def tail(self, n):
+        n = min(max(n, 0), self._size)
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            idx = slice(start, start + n)
+            return BarWindow(self.timestamps[idx].copy(), self.values[:, idx].copy())
+        idx = np.arange(start, start + n) % self.capacity
+        return BarWindow(self.timestamps[idx], self.values[:, idx])
+
+    def between(self, start_ns, end_ns):
+        # Bars with start_ns < timestamp <= end_ns
+        timestamps = []
+        values = []
+        for seg in self._segments():
+            ts = self.timestamps[seg]
+            lo = np.searchsorted(ts, start_ns, side="right")
+            hi = np.searchsorted(ts, end_ns, side="right")
+            if lo < hi:
+                timestamps.append(ts[lo:hi])
+                values.append(self.values[:, seg][:, lo:hi])
+
+        if not timestamps:
+            return _empty_window()
+        return BarWindow(np.concatenate(timestamps), np.concatenate(values, axis=1))
+
+
+class RecentBarStore:
+    """Process-local cache of the most recent bars for each symbol.
+
+    Every symbol gets a preallocated ring buffer of ``capacity`` bars, so the
+    memory used is fixed at roughly ``capacity * 64`` bytes per symbol.
+    """
+
+    def __init__(self, capacity=None):
+        if capacity is None:
+            capacity = os.getenv("RECENT_BARS_CAPACITY", DEFAULT_CAPACITY)
+        self.capacity = int(capacity)
+        if self.capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._buffers = {}
+
+    def __contains__(self, symbol):
+        return symbol in self._buffers
+
+    def __len__(self):
+        return len(self._buffers)
+
+    @property
+    def symbols(self):
+        return list(self._buffers)
+
+    @property
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def _buffer(self, symbol):
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            buffer = self._buffers[symbol] = BarRingBuffer(self.capacity)
+        return buffer
+
+    def update_from_df(self, symbol, df):
+        # df in the get_historical_df layout: timestamp index, BAR_COLUMNS
+        if df.empty:
+            return
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is None:
+            raise ValueError("DataFrame index must be timezone aware")
+        timestamps = index.as_unit("ns").asi8
+        values = df[list(BAR_COLUMNS)].to_numpy(dtype=np.float64)
+
+        buffer = self._buffer(symbol)
+        # Only the trailing rows can fit, skip the rest up front
+        start = max(len(df) - buffer.capacity, 0)
+        last_ts = buffer.last_timestamp
+        if last_ts is not None:
+            # Polls resend the whole day, skip bars older than the newest held
+            start = max(start, int(np.searchsorted(timestamps, last_ts)))
+        for i in range(start, len(df)):
+            buffer.append(timestamps[i], values[i])
+
+    def update_from_records(self, symbol, records):
+        # records are (timestamp, *BAR_COLUMNS) rows in ascending timestamp order
+        buffer = self._buffer(symbol)
+        for record in records[-buffer.capacity :]:
+            buffer.append(_to_ns(record[0]), record[1:])
+
+    def latest(self, symbol):
+        buffer = self._buffers.get(symbol)
+        return buffer.latest() if buffer else None
+
+    def tail(self, symbol, n):
+        buffer = self._buffers.get(symbol)
+        return buffer.tail(n) if buffer else _empty_window()
+
+    def window(self, symbol, duration: timedelta, end=None):
+        """Return the bars in the ``duration`` leading up to ``end``.
+
+        ``end`` defaults to the latest bar held for the symbol rather than the
+        current time, so a window still returns data outside market hours.
+        An explicit ``end`` must be timezone aware, e.g.
+        ``datetime.now(timezone.utc)``.
+        """
+        end_ns = None if end is None else _to_ns(end)
+        buffer = self._buffers.get(symbol)
+        if not buffer:
+            return _empty_window()
+        if end_ns is None:
+            end_ns = buffer.last_timestamp
+        start_ns = end_ns - pd.Timedelta(duration).value
+        return buffer.between(start_ns, end_ns)
+
+
+def seed_recent_bars(store, connection, schema_name, table_name, symbol):
+    records = get_recent_records(connection, schema_name, table_name, store.capacity)
+    store.update_from_records(symbol, records)
+    if not records:
+        logging.warning(
+            f"No bars found in {schema_name}.{table_name}, {symbol} starts empty"
+        )
+        return
+    logging.info(
+        f"Seeded {len(records)} bars for {symbol} from {schema_name}.{table_name}"
+    )
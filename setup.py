@@ -7,6 +7,7 @@ setup(
     install_requires=[
         "boto3>=1.34.157",
         "ib_async>=1.0.3",
+        "numpy>=1.26.0",
         "pandas>=2.2.2",
         "psycopg2-binary>=2.9.9",
         "python-dotenv>=1.0.1",